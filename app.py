@@ -1,8 +1,27 @@
 import streamlit as st
 from pedal_steel import PedalSteel, Note
-from chord_finder import ChordFinder, CHORD_TYPES
+from chord_finder import ChordFinder, CHORD_TYPES, NOTE_NAMES
 from chord_lookup import find_chord_positions
 
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_chord_positions(target_root: str, target_type: str, min_strings: int):
+    return find_chord_positions(target_root, target_type, min_strings=min_strings)
+
+
+# Row shading for strings that sound a chord tone
+CHORD_ROW_STYLE = ' style="background-color: rgba(76, 175, 80, 0.3)"'
+
+
+def fretboard_html(notes: list, in_chord_flags: list) -> str:
+    """Build the fretboard diagram as an HTML table (string 1 first), shading chord strings."""
+    rows = "".join(
+        f"<tr{CHORD_ROW_STYLE if in_chord else ''}><td>{i}</td><td>{note}</td></tr>"
+        for i, (note, in_chord) in enumerate(zip(notes, in_chord_flags), 1)
+    )
+    return f"<table><tr><th>String</th><th>Note</th></tr>{rows}</table>"
+
+
 # --- Streamlit UI setup ---
 st.set_page_config(page_title="Pedal Steel Chord Finder", layout="centered")
 st.title("Pedal Steel Chord Finder")
@@ -10,7 +29,9 @@ st.title("Pedal Steel Chord Finder")
 mode = st.sidebar.radio("Mode", ["Chords at Position", "Find Positions for Chord"], key="mode_radio")
 
 # --- PedalSteel and ChordFinder setup ---
-import pandas as pd
+# One PedalSteel per session; each rerun only updates its fret and pedal/lever state
+if 'steel' not in st.session_state:
+    st.session_state.steel = PedalSteel()
 
 if mode == "Chords at Position":
     st.header("Chords at Position")
@@ -19,7 +40,7 @@ if mode == "Chords at Position":
     fret = st.sidebar.slider("Fret", min_value=0, max_value=24, value=0, key="fret_tab1")
     show_octave = st.sidebar.checkbox("Show Octave Numbers", value=True, key="octave_tab1")
 
-    steel1 = PedalSteel()
+    steel1 = st.session_state.steel
     steel1.set_fret(fret)
 
     st.sidebar.subheader("Pedals")
@@ -43,26 +64,28 @@ if mode == "Chords at Position":
     Note.show_octave = show_octave
     notes = steel1.get_current_notes()
 
+    pitch_classes, _ = steel1.get_current_pitch_classes()
+
     chord_finder1 = ChordFinder()
-    pitch_classes = [n if not show_octave else n[:-1] if n[-1].isdigit() else n for n in notes]
-    chords = chord_finder1.find_chords(pitch_classes)
+    chords = chord_finder1.find_chords_in_mask(chord_finder1.indices_to_mask(pitch_classes))
 
     st.subheader("Possible Chords")
     if chords:
         chord_string_counts = []
+        # Chords spelled by the same notes (e.g. E sus2 / B sus4) share one string list
+        strings_by_mask = {}
         for chord in chords:
-            chord_note_set = set(chord['notes'])
-            string_numbers = [
-                10 - idx for idx, n in enumerate(notes)
-                if (n if not show_octave else n[:-1] if n[-1].isdigit() else n) in chord_note_set
-            ]
+            chord_notes_mask = chord_finder1.notes_to_mask(chord['notes'])
+            if chord_notes_mask not in strings_by_mask:
+                strings_by_mask[chord_notes_mask] = [
+                    10 - idx for idx, pc in enumerate(pitch_classes.tolist())
+                    if chord_notes_mask >> pc & 1
+                ]
+            string_numbers = strings_by_mask[chord_notes_mask]
             chord_string_counts.append((chord, len(string_numbers), string_numbers))
         # Sort by chord type order (from CHORD_TYPES), then by number of strings (descending)
-        chord_type_order = list(CHORD_TYPES.keys())
-        chord_string_counts.sort(key=lambda x: (
-            chord_type_order.index(x[0]['type']) if x[0]['type'] in chord_type_order else 999,
-            -x[1]
-        ))
+        chord_type_order = {chord_type: i for i, chord_type in enumerate(CHORD_TYPES)}
+        chord_string_counts.sort(key=lambda x: (chord_type_order.get(x[0]['type'], 999), -x[1]))
         sorted_chords = [x[0] for x in chord_string_counts]
         sorted_string_numbers = [x[2] for x in chord_string_counts]
 
@@ -77,30 +100,12 @@ if mode == "Chords at Position":
             key="chord_select_tab1"
         )
         selected_chord = sorted_chords[selected_idx]
-        chord_note_set = set(selected_chord['notes'])
+        chord_notes_mask = chord_finder1.notes_to_mask(selected_chord['notes'])
         selected_string_numbers = sorted_string_numbers[selected_idx]
 
         st.subheader("Fretboard Diagram")
-        fretboard_table = []
-        in_chord_flags = []
-        for i, note in enumerate(reversed(notes), 1):
-            note_name = note if not show_octave else note[:-1] if note[-1].isdigit() else note
-            in_chord = note_name in chord_note_set
-            in_chord_flags.append(in_chord)
-            fretboard_table.append({
-                "String": i,
-                "Note": note
-            })
-        fretboard_df = pd.DataFrame(fretboard_table)
-
-        # Apply row shading for notes in chord
-        def highlight_rows(row):
-            if in_chord_flags[row.name]:
-                return ['background-color: rgba(76, 175, 80, 0.3)'] * len(row)
-            return [''] * len(row)
-
-        styled_df = fretboard_df.style.apply(highlight_rows, axis=1)
-        st.dataframe(styled_df, hide_index=True)
+        in_chord_flags = [bool(chord_notes_mask >> pc & 1) for pc in reversed(pitch_classes.tolist())]
+        st.markdown(fretboard_html(list(reversed(notes)), in_chord_flags), unsafe_allow_html=True)
 
         string_numbers_str = ', '.join(str(s) for s in sorted(selected_string_numbers, reverse=True))
         st.write(f"**{selected_chord['root']} {selected_chord['type']}** uses strings: {string_numbers_str}")
@@ -115,14 +120,15 @@ elif mode == "Find Positions for Chord":
     if 'positions' not in st.session_state:
         st.session_state.positions = None
 
-    roots = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+    roots = NOTE_NAMES
     types = [
         'maj', 'min', 'dim', 'aug', 'sus2', 'sus4',
         'maj7', '7', 'min7', 'm7b5', 'dim7', '6', 'min6',
         '9', 'maj9', 'min9', '11', 'maj11', 'min11', '13', 'maj13', 'min13'
     ]
-    target_root = st.sidebar.selectbox("Chord Root", roots, index=roots.index('E'), key="target_root")
-    target_type = st.sidebar.selectbox("Chord Type", types, index=types.index('maj'), key="target_type")
+    # Defaults: E maj
+    target_root = st.sidebar.selectbox("Chord Root", roots, index=4, key="target_root")
+    target_type = st.sidebar.selectbox("Chord Type", types, index=0, key="target_type")
 
     min_strings = st.sidebar.slider("Minimum strings to use", 3, 10, 3, key="min_strings")
 
@@ -143,7 +149,7 @@ elif mode == "Find Positions for Chord":
 
     if st.button("Find Positions", key="find_positions_btn"):
         with st.spinner("Searching for positions..."):
-            positions = find_chord_positions(target_root, target_type, min_strings=min_strings)
+            positions = cached_chord_positions(target_root, target_type, min_strings)
 
             # Filter by fret if specified
             if use_fret_filter and target_fret is not None:
@@ -176,7 +182,7 @@ elif mode == "Find Positions for Chord":
 
         # Display selected position
         pos = results_to_show[selected_idx]
-        steel2 = PedalSteel()
+        steel2 = st.session_state.steel
         steel2.set_fret(pos['fret'])
         for p in steel2.pedal_lever_objects:
             steel2.pedal_lever_objects[p].active = False
@@ -201,26 +207,9 @@ elif mode == "Find Positions for Chord":
         )
 
         st.subheader("Fretboard Diagram")
-        fretboard_table = []
-        in_chord_flags = []
-        # Iterate from string 1 to 10 to match the other diagram
-        for i, note in enumerate(reversed(notes2), 1):
-            is_in_chord = i in pos['strings']
-            in_chord_flags.append(is_in_chord)
-            fretboard_table.append({
-                "String": i,
-                "Note": note
-            })
-        fretboard_df = pd.DataFrame(fretboard_table)
-
-        # Apply row shading for notes in chord
-        def highlight_rows(row):
-            if in_chord_flags[row.name]:
-                return ['background-color: rgba(76, 175, 80, 0.3)'] * len(row)
-            return [''] * len(row)
-
-        styled_df = fretboard_df.style.apply(highlight_rows, axis=1)
-        st.dataframe(styled_df, hide_index=True)
+        # List from string 1 to 10 to match the other diagram
+        in_chord_flags = [i in pos['strings'] for i in range(1, 11)]
+        st.markdown(fretboard_html(list(reversed(notes2)), in_chord_flags), unsafe_allow_html=True)
 
     # Handle case where a search was performed but no results were found
     elif st.session_state.positions is not None:
@@ -1,9 +1,11 @@
 # ChordFinder: Identify chords from a list of note names (pitch classes, no octaves)
-from itertools import combinations
-from typing import List, Dict, Tuple, Set
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Dict, Tuple, Set
 
-NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'Bb', 'B']
+NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+# Note name -> pitch class index; flats are accepted as input but always reported as sharps
 NOTE_INDEX = {name: i for i, name in enumerate(NOTE_NAMES)}
+NOTE_INDEX.update({'Db': 1, 'Eb': 3, 'Gb': 6, 'Ab': 8, 'Bb': 10})
 
 # Chord formulas: intervals in semitones from root
 CHORD_TYPES = {
@@ -31,6 +33,43 @@ CHORD_TYPES = {
     'min13': [0, 3, 7, 10, 2, 5, 9],   # minor 13th
 }
 
+# Pitch-class sets are 12-bit masks (bit i set = NOTE_NAMES[i] present)
+ALL_PITCH_CLASSES = (1 << 12) - 1
+
+def transpose_mask(mask: int, semitones: int) -> int:
+    """Transpose a pitch class mask up by rotating it within 12 bits."""
+    semitones %= 12
+    return ((mask << semitones) | (mask >> (12 - semitones))) & ALL_PITCH_CLASSES
+
+def iter_submasks(mask: int) -> Iterator[int]:
+    """Yield every non-empty submask of mask, largest first."""
+    sub = mask
+    while sub:
+        yield sub
+        sub = (sub - 1) & mask
+
+# Mask of each chord formula rooted on C
+FORMULA_MASKS: Dict[str, int] = {
+    chord_name: sum(1 << (iv % 12) for iv in formula)
+    for chord_name, formula in CHORD_TYPES.items()
+}
+
+# Mask of every (root index, type), built once so lookups never re-walk a formula
+CHORD_MASKS: Dict[Tuple[int, str], int] = {
+    (root, chord_name): transpose_mask(formula_mask, root)
+    for chord_name, formula_mask in FORMULA_MASKS.items()
+    for root in range(12)
+}
+
+# Map every chord mask to the (root, type) pairs it spells; symmetric chords
+# such as dim7 and aug share one mask across several roots.
+CHORD_MASK_TABLE: Dict[int, List[Tuple[str, str]]] = {}
+for (_root, _chord_name), _mask in CHORD_MASKS.items():
+    CHORD_MASK_TABLE.setdefault(_mask, []).append((NOTE_NAMES[_root], _chord_name))
+
+# Fewest notes in any chord formula (a triad)
+MIN_CHORD_SIZE = min(len(formula) for formula in CHORD_TYPES.values())
+
 class ChordFinder:
     def __init__(self):
         self.chord_types = CHORD_TYPES
@@ -45,38 +84,52 @@ class ChordFinder:
         """Convert note names to a set of pitch class indices."""
         return set(self.note_to_index(n) for n in notes)
 
+    def notes_to_mask(self, notes: List[str]) -> int:
+        """Convert note names to a 12-bit pitch class mask."""
+        notes_mask = 0
+        for n in notes:
+            notes_mask |= 1 << self.note_to_index(n)
+        return notes_mask
+
+    def indices_to_mask(self, indices: Iterable[int]) -> int:
+        """Convert pitch class indices (0 = C) to a 12-bit pitch class mask."""
+        notes_mask = 0
+        for i in indices:
+            notes_mask |= 1 << int(i)
+        return notes_mask
+
     def find_chords(self, notes: List[str]) -> List[Dict]:
         """
         Given a list of note names (pitch classes, e.g. ['E', 'G#', 'B', 'D']),
         return a list of matching chords with root, type, and notes used.
         """
-        found_chords = []
-        unique_notes = list(set(notes))
-        note_indices = [self.note_to_index(n) for n in unique_notes]
-
-        # Try all combinations of 3 to 7 notes (triads up to 13th chords)
-        for size in [3, 4, 5, 6, 7]:
-            for combo in combinations(note_indices, size):
-                for root_idx in combo:
-                    intervals = sorted(((n - root_idx) % 12 for n in combo))
-                    for chord_name, formula in self.chord_types.items():
-                        if len(formula) == size and sorted(formula) == intervals:
-                            root_name = NOTE_NAMES[root_idx]
-                            chord_notes = [NOTE_NAMES[n] for n in combo]
-                            found_chords.append({
-                                'root': root_name,
-                                'type': chord_name,
-                                'notes': chord_notes
-                            })
-        # Remove duplicates (same root, type, notes)
-        unique_chords = []
-        seen = set()
-        for chord in found_chords:
-            key = (chord['root'], chord['type'], tuple(sorted(chord['notes'])))
-            if key not in seen:
-                unique_chords.append(chord)
-                seen.add(key)
-        return unique_chords
+        return self.find_chords_in_mask(self.notes_to_mask(notes))
+
+    def find_chords_in_mask(self, notes_mask: int) -> List[Dict]:
+        """Like find_chords, but takes the notes as a pitch class mask."""
+        return [
+            {'root': root_name, 'type': chord_name, 'notes': list(chord_notes)}
+            for root_name, chord_name, chord_notes in _chords_in_mask(notes_mask)
+        ]
+
+@lru_cache(maxsize=4096)
+def _chords_in_mask(notes_mask: int) -> Tuple[Tuple[str, str, Tuple[str, ...]], ...]:
+    """Return (root, type, notes) for every chord spelled by a subset of notes_mask."""
+    # Duplicate notes already collapsed into the mask; too few distinct
+    # pitch classes cannot spell even a triad
+    if notes_mask.bit_count() < MIN_CHORD_SIZE:
+        return ()
+
+    # Keep the submasks that spell a chord; triads are listed first, 13ths last
+    chord_masks = [sub for sub in iter_submasks(notes_mask) if sub in CHORD_MASK_TABLE]
+    chord_masks.sort(key=lambda m: (m.bit_count(), m))
+
+    found_chords = []
+    for sub in chord_masks:
+        chord_notes = tuple(NOTE_NAMES[i] for i in range(12) if sub >> i & 1)
+        for root_name, chord_name in CHORD_MASK_TABLE[sub]:
+            found_chords.append((root_name, chord_name, chord_notes))
+    return tuple(found_chords)
 
 if __name__ == "__main__":
     # Example usage
@@ -2,14 +2,16 @@
 chord_lookup.py
 
 Finds practical fret/pedal/lever combinations for a target chord on a pedal steel guitar.
-Uses PedalSteel and ChordFinder classes.
+Uses the PedalSteel class and the chord formulas from chord_finder.
 
 Usage example (run as script):
     python chord_lookup.py "E" "maj"
 """
 
-from pedal_steel import PedalSteel, Note
-from chord_finder import ChordFinder
+import numpy as np
+
+from pedal_steel import PedalSteel, Note, format_semitone
+from chord_finder import CHORD_MASKS, CHORD_TYPES, NOTE_INDEX
 from itertools import product
 from typing import List, Dict, Tuple, Optional
 
@@ -18,50 +20,100 @@ from typing import List, Dict, Tuple, Optional
 PEDAL_NAMES = ['A', 'B', 'C']
 KNEE_NAMES = ['LKL', 'LKR', 'RKL', 'RKR']
 
+# Single or two adjacent pedals
+PEDAL_COMBOS: Tuple[Tuple[str, ...], ...] = (
+    (),
+    ('A',),
+    ('B',),
+    ('C',),
+    ('A', 'B'),
+    ('B', 'C'),
+)
+# At most one lever per knee
+KNEE_COMBOS: Tuple[Tuple[str, ...], ...] = tuple(
+    left + right
+    for left in ((), ('LKL',), ('LKR',))
+    for right in ((), ('RKL',), ('RKR',))
+)
+# (pedal combo index, knee combo index, pedals, knees) for every practical combination
+ALL_COMBOS: Tuple[Tuple[int, int, Tuple[str, ...], Tuple[str, ...]], ...] = tuple(
+    (p_idx, k_idx, pedals, knees)
+    for p_idx, pedals in enumerate(PEDAL_COMBOS)
+    for k_idx, knees in enumerate(KNEE_COMBOS)
+)
+
 def get_practical_pedal_combos() -> List[List[str]]:
     """Return all practical pedal combinations: single or two adjacent pedals."""
-    combos = [
-        [],
-        ['A'],
-        ['B'],
-        ['C'],
-        ['A', 'B'],
-        ['B', 'C'],
-    ]
-    return combos
+    return [list(pedals) for pedals in PEDAL_COMBOS]
 
 def get_practical_knee_combos() -> List[List[str]]:
     """Return all practical knee lever combinations."""
-    left_options = [[], ['LKL'], ['LKR']]
-    right_options = [[], ['RKL'], ['RKR']]
-    combos = []
-    for left in left_options:
-        for right in right_options:
-            combos.append(left + right)
-    return combos
+    return [list(knees) for knees in KNEE_COMBOS]
 
 def get_all_practical_combos() -> List[Dict[str, List[str]]]:
     """Return all practical combinations of pedals and knee levers."""
-    pedal_combos = get_practical_pedal_combos()
-    knee_combos = get_practical_knee_combos()
-    all_combos = []
-    for pedals in pedal_combos:
-        for knees in knee_combos:
-            all_combos.append({
-                'pedals': pedals,
-                'knees': knees
-            })
-    return all_combos
-
-def get_pitch_classes(notes: List[str]) -> List[str]:
-    """Remove octave from notes, return pitch classes."""
-    pcs = []
-    for n in notes:
-        if n[-1].isdigit():
-            pcs.append(n[:-1])
-        else:
-            pcs.append(n)
-    return pcs
+    return [{'pedals': list(pedals), 'knees': list(knees)} for _, _, pedals, knees in ALL_COMBOS]
+
+# --- Precomputed fret/pedal/lever note tables ---
+
+MAX_FRET = 24
+# Bitmask with every string set, over the 0-based string indices
+ALL_STRINGS = (1 << 10) - 1
+
+def _build_config_semitones() -> np.ndarray:
+    """
+    Return the absolute pitch (12 * octave + pitch class) of every string for every
+    fret and practical pedal/knee combination, shaped (fret, pedal combo, knee combo, string).
+    """
+    steel = PedalSteel()
+    deltas = np.zeros((len(PEDAL_COMBOS), len(KNEE_COMBOS), 10), dtype=np.int16)
+    for p_idx, k_idx, pedals, knees in ALL_COMBOS:
+        for name in pedals + knees:
+            deltas[p_idx, k_idx] += steel.pedal_lever_objects[name].delta
+    frets = np.arange(MAX_FRET + 1, dtype=np.int16)
+    return steel.open_semitones[None, None, None, :] + frets[:, None, None, None] + deltas[None, :, :, :]
+
+def _build_lever_masks() -> np.ndarray:
+    """
+    Return the affected-string mask of each active pedal/lever for every practical
+    pedal/knee combination, shaped (pedal combo, knee combo, 4). Unused slots hold
+    ALL_STRINGS so they never mark a position as redundant.
+    """
+    steel = PedalSteel()
+    masks = np.full((len(PEDAL_COMBOS), len(KNEE_COMBOS), 4), ALL_STRINGS, dtype=np.uint16)
+    for p_idx, k_idx, pedals, knees in ALL_COMBOS:
+        for slot, name in enumerate(pedals + knees):
+            masks[p_idx, k_idx, slot] = steel.pedal_lever_objects[name].affected_mask
+    return masks
+
+def _pitch_class_tables(config_semitones: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the pitch class (0..11) of every string and the 12-bit pitch-class mask of
+    each configuration. Pitch classes are uint16 so the bit shifts stay uint16 under
+    NumPy 1.x and 2.x type promotion.
+    """
+    config_notes = (config_semitones % 12).astype(np.uint16)
+    config_mask = np.bitwise_or.reduce(np.uint16(1) << config_notes, axis=-1)
+    return config_notes, config_mask
+
+def _config_tables(max_fret: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (semitones, pitch classes, masks) for frets 0..max_fret."""
+    if max_fret <= MAX_FRET:
+        return (
+            CONFIG_SEMITONES[:max_fret + 1],
+            CONFIG_NOTES[:max_fret + 1],
+            CONFIG_MASK[:max_fret + 1],
+        )
+    # Past the precomputed frets, extend the open-position row by each fret
+    frets = np.arange(max_fret + 1, dtype=np.int16)
+    config_semitones = CONFIG_SEMITONES[0][None, :, :, :] + frets[:, None, None, None]
+    return (config_semitones,) + _pitch_class_tables(config_semitones)
+
+CONFIG_SEMITONES = _build_config_semitones()
+CONFIG_LEVER_MASKS = _build_lever_masks()
+CONFIG_NOTES, CONFIG_MASK = _pitch_class_tables(CONFIG_SEMITONES)
+# Bit for each 0-based string index, matching PedalOrLever.affected_mask
+STRING_BITS = np.uint16(1) << np.arange(10, dtype=np.uint16)
 
 def find_chord_positions(
     target_root: str,
@@ -72,68 +124,40 @@ def find_chord_positions(
     """
     For a given chord (root and type), find all practical fret/pedal/lever combos that produce it.
     Returns a list of dicts with fret, pedals, knees, and strings used.
+    Frets up to MAX_FRET come from the precomputed tables; higher ones are computed per call.
     """
-    steel = PedalSteel()
-    finder = ChordFinder()
+    # A negative max_fret searches no frets; guard before slicing so it can't index from the end
+    if max_fret < 0 or target_root not in NOTE_INDEX or target_type not in CHORD_TYPES:
+        return []
+    target_mask = CHORD_MASKS[NOTE_INDEX[target_root], target_type]
+
     results = []
 
-    all_combos = get_all_practical_combos()
-
-    for fret in range(0, max_fret + 1):
-        steel.set_fret(fret)
-        for combo in all_combos:
-            # Reset all pedals/levers
-            for p in PEDAL_NAMES + KNEE_NAMES:
-                steel.pedal_lever_objects[p].active = False
-            # Activate pedals
-            for p in combo['pedals']:
-                steel.pedal_lever_objects[p].active = True
-            # Activate knees
-            for k in combo['knees']:
-                steel.pedal_lever_objects[k].active = True
-
-            notes = steel.get_current_notes()
-            pitch_classes = get_pitch_classes(notes)
-            chords = finder.find_chords(pitch_classes)
-
-            # Find if target chord is present
-            for chord in chords:
-                if chord['root'] == target_root and chord['type'] == target_type:
-                    # Which strings are used?
-                    chord_note_set = set(chord['notes'])
-                    string_numbers = [
-                        10 - idx for idx, n in enumerate(notes)
-                        if (n[:-1] if n[-1].isdigit() else n) in chord_note_set
-                    ]
-                    if len(string_numbers) >= min_strings:
-                        # Check for redundant pedals/levers
-                        is_valid_position = True
-                        active_pl_names = combo['pedals'] + combo['knees']
-                        if active_pl_names:
-                            chord_strings_set = set(string_numbers)
-                            for pl_name in active_pl_names:
-                                pl_obj = steel.pedal_lever_objects[pl_name]
-                                # A pedal/lever is useful if it affects at least one string in the chord
-                                is_pl_useful = False
-                                for string_index in pl_obj.strings_affected:
-                                    # Convert 0-based index to 1-based string number
-                                    string_num = 10 - string_index
-                                    if string_num in chord_strings_set:
-                                        is_pl_useful = True
-                                        break  # This pedal/lever is useful, check the next one
-                                if not is_pl_useful:
-                                    # This pedal/lever is redundant, so the whole position is invalid
-                                    is_valid_position = False
-                                    break  # No need to check other pedals/levers for this combo
-
-                        if is_valid_position:
-                            results.append({
-                                'fret': fret,
-                                'pedals': combo['pedals'],
-                                'knees': combo['knees'],
-                                'strings': sorted(string_numbers, reverse=True),
-                                'notes': [notes[9 - (s - 1)] for s in sorted(string_numbers, reverse=True)]
-                            })
+    # Narrow to the configurations where every chord note is sounding, then test
+    # only those rows: enough strings must land on chord tones, and a pedal/lever
+    # is redundant unless it affects at least one string in the chord
+    config_semitones, config_notes, config_mask = _config_tables(max_fret)
+    frets, p_idxs, k_idxs = np.nonzero(config_mask & target_mask == target_mask)
+    in_chord = (np.uint16(1) << config_notes[frets, p_idxs, k_idxs]) & target_mask != 0
+    chord_strings_masks = (in_chord * STRING_BITS).sum(axis=-1, dtype=np.uint16)
+    no_redundant_levers = np.all(
+        CONFIG_LEVER_MASKS[p_idxs, k_idxs] & chord_strings_masks[:, None] != 0, axis=-1
+    )
+    keep = (in_chord.sum(axis=-1) >= min_strings) & no_redundant_levers
+
+    frets, p_idxs, k_idxs = frets[keep], p_idxs[keep], k_idxs[keep]
+    for fret, p_idx, k_idx, chord_strings_mask, semitones in zip(
+        frets.tolist(), p_idxs.tolist(), k_idxs.tolist(),
+        chord_strings_masks[keep].tolist(), config_semitones[frets, p_idxs, k_idxs].tolist()
+    ):
+        string_indices = [idx for idx in range(10) if chord_strings_mask >> idx & 1]
+        results.append({
+            'fret': fret,
+            'pedals': list(PEDAL_COMBOS[p_idx]),
+            'knees': list(KNEE_COMBOS[k_idx]),
+            'strings': [10 - idx for idx in string_indices],
+            'notes': [format_semitone(semitones[idx]) for idx in string_indices]
+        })
     # Sort by number of strings (descending), then fret, then pedals/knees
     results.sort(key=lambda x: (-len(x['strings']), x['fret'], x['pedals'], x['knees']))
     return results
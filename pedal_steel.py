@@ -1,10 +1,9 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from chord_finder import ChordFinder
+import numpy as np
 
+from chord_finder import ChordFinder, NOTE_NAMES, NOTE_INDEX
 
-# Helper: note names in order, for transposition
-NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'Bb', 'B']
 
 class Note:
     # Application-wide setting for displaying octave
@@ -13,6 +12,7 @@ class Note:
     def __init__(self, name: str, octave: int):
         self.name = name
         self.octave = octave
+        self.idx = NOTE_INDEX[name]
 
     @classmethod
     def from_string(cls, note_str: str):
@@ -25,10 +25,13 @@ class Note:
             octave = int(note_str[2])
         return cls(name, octave)
 
+    @property
+    def semitone(self) -> int:
+        """Absolute pitch as 12 * octave + pitch class index."""
+        return 12 * self.octave + self.idx
+
     def __add__(self, semitones: int):
-        idx = NOTE_NAMES.index(self.name)
-        idx_new = idx + semitones
-        octave_shift, idx_final = divmod(idx_new, 12)
+        octave_shift, idx_final = divmod(self.idx + semitones, 12)
         return Note(NOTE_NAMES[idx_final], self.octave + octave_shift)
 
     def __str__(self):
@@ -40,6 +43,13 @@ class Note:
     def __repr__(self):
         return str(self)
 
+def format_semitone(semitone: int) -> str:
+    """Format an absolute pitch (12 * octave + pitch class) like str(Note)."""
+    octave, idx = divmod(semitone, 12)
+    if Note.show_octave:
+        return f"{NOTE_NAMES[idx]}{octave}"
+    return NOTE_NAMES[idx]
+
 class PedalOrLever:
     def __init__(self, strings: list, semitone_change: int):
         """
@@ -48,8 +58,13 @@ class PedalOrLever:
         """
         # Convert string numbers to 0-based indices (0 = string 10, 9 = string 1)
         self.indices = [10 - s for s in strings]
+        # Same strings as a bitmask over the 0-based indices
+        self.affected_mask = sum(1 << idx for idx in self.indices)
         self.semitone_change = semitone_change
         self.active = False
+        # Semitone change per string index, for adding straight onto string pitches
+        self.delta = np.zeros(10, dtype=np.int16)
+        self.delta[self.indices] = semitone_change
 
     def activate(self):
         self.active = True
@@ -85,6 +100,9 @@ class PedalSteel:
             Note.from_string('D#5'),  # 2
             Note.from_string('F#5'),  # 1
         ]
+        self.open_semitones = np.array(
+            [note.semitone for note in self.open_strings], dtype=np.int16
+        )
         self.fret = 0  # 0 = open
 
         # Define pedal and lever logic (string numbers: 1 = highest, 10 = lowest)
@@ -105,22 +123,24 @@ class PedalSteel:
     def set_fret(self, fret: int):
         self.fret = fret
 
-    def get_current_notes(self) -> List[str]:
+    def get_current_semitones(self) -> np.ndarray:
+        """Return the absolute pitch of each string (string 10 to 1) as an int16 array."""
         # Start with open strings, apply fret
-        notes = [note + self.fret for note in self.open_strings]
+        total = self.open_semitones + self.fret
 
-        # Gather all active pedals/levers
-        active = [obj for obj in self.pedal_lever_objects.values() if obj.active]
+        # Apply all active pedal/lever changes
+        for obj in self.pedal_lever_objects.values():
+            if obj.active:
+                total = total + obj.delta
+        return total
 
-        # Sum all semitone changes for each string
-        semitone_changes = [0] * 10
-        for obj in active:
-            for idx, delta in enumerate(obj.get_changes(10)):
-                semitone_changes[idx] += delta
+    def get_current_pitch_classes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (pitch class index, octave) int8 arrays for each string (string 10 to 1)."""
+        octaves, pitch_classes = np.divmod(self.get_current_semitones(), 12)
+        return pitch_classes.astype(np.int8), octaves.astype(np.int8)
 
-        # Apply pedal/lever changes
-        notes = [note + semitone_changes[i] for i, note in enumerate(notes)]
-        return [str(note) for note in notes]
+    def get_current_notes(self) -> List[str]:
+        return [format_semitone(t) for t in self.get_current_semitones().tolist()]
 
     def print_current_notes(self):
         notes = self.get_current_notes()
@@ -130,18 +150,17 @@ class PedalSteel:
             print(f"String {i}: {note}")
 
         # Find and print all possible chords
-        # Remove octave for chord finding
-        pitch_classes = [str(note) if isinstance(note, str) else note.name for note in notes]
+        pitch_classes = self.get_current_pitch_classes()[0].tolist()
         finder = ChordFinder()
-        chords = finder.find_chords(pitch_classes)
+        chords = finder.find_chords_in_mask(finder.indices_to_mask(pitch_classes))
         if chords:
             print("\nPossible chords found:")
             for chord in chords:
                 # Find which strings are used in this chord
-                chord_note_set = set(chord['notes'])
+                chord_notes_mask = finder.notes_to_mask(chord['notes'])
                 string_numbers = [
-                    10 - idx for idx, n in enumerate(notes)
-                    if (str(n) if isinstance(n, str) else n.name) in chord_note_set
+                    10 - idx for idx, pc in enumerate(pitch_classes)
+                    if chord_notes_mask >> pc & 1
                 ]
                 string_numbers_str = ', '.join(str(s) for s in sorted(string_numbers, reverse=True))
                 print(f"{chord['root']} {chord['type']} (strings: {string_numbers_str})")